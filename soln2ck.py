@@ -25,7 +25,9 @@ def write(solution):
                                     'pym_' +
                                     input_file_name_stripped +
                                     '.inp')
-    with open(output_file_name, 'w+') as f:
+    #large buffer so the many small writes below coalesce into few
+    #physical writes; newline='' skips per-write newline translation
+    with open(output_file_name, 'w+', buffering=1 << 20, newline='') as f:
 
         #Work functions
 
@@ -151,32 +153,34 @@ def write(solution):
             """
             line_coeffs = ''
             lines = [[1, 2, 3, 4, 5], [6, 7, 8, 9, 10], [11, 12, 13, 14]]
-            line_index = lines[row-2]
-            for ix, c in enumerate(nasa_coeffs):
-                if ix in line_index:
-                    if c >= 0:
-                        line_coeffs += ' '
-                    line_coeffs += str('{:.8e}'.format(c))
+            #index the wanted coefficients directly instead of scanning
+            #the whole array with a membership test per entry
+            for ix in lines[row-2]:
+                c = nasa_coeffs[ix]
+                if c >= 0:
+                    line_coeffs += ' '
+                line_coeffs += str('{:.8e}'.format(c))
             return line_coeffs
 
         def build_species_string():
             """
             formats species string for writing
             """
-            species_list_string = ''
+            parts = []
+            #running length of the string built so far, so the growing
+            #string is never re-measured or copied
+            current_len = 0
             line = 1
-            for sp_index, sp_string in enumerate(trimmed_solution.species_names):
-                sp = ' '
-                #get length of string next species is added
-                length_new = len(sp_string)
-                length_string = len(species_list_string)
-                total = length_new + length_string + 3
+            for sp_string in trimmed_solution.species_names:
                 #if string will go over width, wrap to new line
-                if total >= 70*line:
-                    species_list_string += '\n'
+                if len(sp_string) + current_len + 3 >= 70*line:
+                    parts.append('\n')
                     line += 1
-                species_list_string += sp_string + ((16-len(sp_string))*sp)
-            return species_list_string
+                    current_len += 1
+                chunk = sp_string + ((16-len(sp_string))*' ')
+                parts.append(chunk)
+                current_len += len(chunk)
+            return ''.join(parts)
 
         title = ''
         section_break = ('!'+ "-"*75 + '\n'
@@ -255,6 +259,14 @@ def write(solution):
         title = 'Reaction Data'
         f.write(section_break)
         f.write('REACTIONS\n')
+        #characters rewriting the efficiencies dict repr, shared by all
+        #reactions
+        replace_list_2 = {
+                            '{':'',
+                            '}':'/',
+                            '\'':'',
+                            ':':'/',
+                            ',':'/'}
         #write data for each reaction in the Solution Object
         for reac_index in range(len(trimmed_solution.reaction_equations())):
             equation_string = str(trimmed_solution.reaction_equation(reac_index))
@@ -273,21 +285,15 @@ def write(solution):
                 f.write(main_line)
                 #trimms efficiencies list
                 efficiencies = equation_object.efficiencies
-                trimmed_efficiencies = equation_object.efficiencies
+                trimmed_efficiencies = dict(efficiencies)
                 for s in efficiencies:
                     if s not in trimmed_solution.species_names:
                         del trimmed_efficiencies[s]
-                replace_list_2 = {
-                                    '{':'',
-                                    '}':'/',
-                                    '\'':'',
-                                    ':':'/',
-                                    ',':'/'}
                 efficiencies_string = replace_multiple(
                                             str(trimmed_efficiencies),
                                                 replace_list_2)
                 secondary_line = str(efficiencies_string) + '\n'
-                if bool(efficiencies) is True:
+                if efficiencies:
                     f.write(secondary_line)
             if equation_type == 'ElementaryReaction':
                 arrhenius = build_arrhenius(equation_object, equation_type)
@@ -328,22 +334,16 @@ def write(solution):
                     pass
                 #trimms efficiencies list
                 efficiencies = equation_object.efficiencies
-                trimmed_efficiencies = equation_object.efficiencies
+                trimmed_efficiencies = dict(efficiencies)
                 for s in efficiencies:
                     if s not in trimmed_solution.species_names:
                         del trimmed_efficiencies[s]
-                replace_list_2 = {
-                                    '{':'',
-                                    '}':'/',
-                                    '\'':'',
-                                    ':':'/',
-                                    ',':'/'}
                 efficiencies_string = replace_multiple(
                                             str(trimmed_efficiencies),
                                                 replace_list_2)
 
                 fourth_line = str(efficiencies_string) + '\n'
-                if bool(efficiencies) is True:
+                if efficiencies:
                     f.write(fourth_line)
             #dupluicate option
             if equation_object.duplicate is True:
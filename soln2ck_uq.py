@@ -1,333 +1,471 @@
-from __future__ import print_function
-from __future__ import division
-
-import os
-from string import Template
-import cantera as ct
-import numpy as np
-
-
-def write(solution, factor=None, fname=None):
-    """Function to write cantera solution object to inp file.
-
-    :param solution:
-        solution: Cantera solution object,
-        factor: vector of size n_reactions,
-        fname: Name of converted chemkin mechanism file
-
-    :return:
-        Name of trimmed Mechanism file (.inp)
-
-    >>> soln2ck.write(gas, factor, fname)
-    """
-    trimmed_solution = solution
-    input_file_name_stripped = trimmed_solution.name
-    cwd = os.getcwd()
-
-    if factor is None:
-        factor = np.ones(solution.n_reactions)
-
-    if fname is None:
-        raise Exception("fname is None")
-
-    output_file_name = os.path.join(fname)
-    with open(output_file_name, 'w+') as f:
-        # Work functions
-        calories_constant = 4184.0  # number of calories in 1000 Joules of energy
-
-        def eliminate(input_string, char_to_replace, spaces='single'):
-            """
-            Eliminate characters from a string
-
-            :param input_string
-                string to be modified
-            :param char_to_replace
-                array of character strings to be removed
-            """
-            for char in char_to_replace:
-                input_string = input_string.replace(char, "")
-            if spaces == 'double':
-                input_string = input_string.replace(" ", "  ")
-            return input_string
-
-        def replace_multiple(input_string, replace_list):
-            """
-            Replace multiple characters in a string
-
-            :param input_string
-                string to be modified
-            :param replace list
-                list containing items to be replaced (value replaces key)
-            """
-            for original_character, new_character in replace_list.items():
-                input_string = input_string.replace(original_character,
-                                                    new_character)
-            return input_string
-
-        def build_arrhenius(equation_object, equation_type, uf):
-            """
-            Builds Arrhenius coefficient string
-
-            :param equation_objects
-                cantera equation object
-            :param equation_type:
-                string of equation type
-            """
-            coeff_sum = sum(equation_object.reactants.values())
-
-            pre_exponential_factor = equation_object.rate.pre_exponential_factor * uf  # weiqi: add the uf
-
-            temperature_exponent = '{:.3f}'.format(equation_object.rate.temperature_exponent)
-            activation_energy = '{:.2f}'.format(equation_object.rate.activation_energy / calories_constant)
-            if equation_type == 'ElementaryReaction':
-                if coeff_sum == 1:
-                    pre_exponential_factor = str(
-                        '{:.3E}'.format(pre_exponential_factor))
-                if coeff_sum == 2:
-                    pre_exponential_factor = str(
-                        '{:.3E}'.format(pre_exponential_factor * 10 ** 3))
-                if coeff_sum == 3:
-                    pre_exponential_factor = str(
-                        '{:.3E}'.format(pre_exponential_factor * 10 ** 6))
-            if equation_type == 'ThreeBodyReaction':
-                if coeff_sum == 1:
-                    pre_exponential_factor = str(
-                        '{:.3E}'.format(pre_exponential_factor * 10 ** 3))
-                if coeff_sum == 2:
-                    pre_exponential_factor = str(
-                        '{:.3E}'.format(pre_exponential_factor * 10 ** 6))
-            if (equation_type != 'ElementaryReaction'
-                    and equation_type != 'ThreeBodyReaction'):
-                pre_exponential_factor = str(
-                    '{:.3E}'.format(pre_exponential_factor))
-            arrhenius = [pre_exponential_factor,
-                         temperature_exponent,
-                         activation_energy]
-            return arrhenius
-
-        def build_modified_arrhenius(equation_object, t_range, uf):
-            """
-            Builds Arrhenius coefficient strings for high and low temperature ranges
-
-            :param equation_objects
-                cantera equation object
-            :param t_range:
-                simple string ('high' or 'low') to designate temperature range
-            """
-            coeff_sum = sum(equation_object.reactants.values())
-            if t_range == 'high':
-                pre_exponential_factor = equation_object.high_rate.pre_exponential_factor * uf
-                temperature_exponent = '{:.3f}'.format(equation_object.high_rate.temperature_exponent)
-                activation_energy = '{:.2f}'.format(equation_object.high_rate.activation_energy / calories_constant)
-                if coeff_sum == 1:
-                    pre_exponential_factor = str(
-                        '{:.3E}'.format(pre_exponential_factor))
-                if coeff_sum == 2:
-                    pre_exponential_factor = str(
-                        '{:.3E}'.format(pre_exponential_factor * 10 ** 3))
-                if coeff_sum == 3:
-                    pre_exponential_factor = str(
-                        '{:.3E}'.format(pre_exponential_factor * 10 ** 6))
-                arrhenius_high = [pre_exponential_factor,
-                                  temperature_exponent,
-                                  activation_energy]
-                return arrhenius_high
-            if t_range == 'low':
-                pre_exponential_factor = equation_object.low_rate.pre_exponential_factor * uf
-                temperature_exponent = '{:.3f}'.format(equation_object.low_rate.temperature_exponent)
-                activation_energy = '{:.2f}'.format(equation_object.low_rate.activation_energy / calories_constant)
-                if coeff_sum == 1:
-                    pre_exponential_factor = str(
-                        '{:.3E}'.format(pre_exponential_factor * 10 ** 3))
-                if coeff_sum == 2:
-                    pre_exponential_factor = str(
-                        '{:.3E}'.format(pre_exponential_factor * 10 ** 6))
-                if coeff_sum == 3:
-                    pre_exponential_factor = str(
-                        '{:.3E}'.format(pre_exponential_factor * 10 ** 9))
-
-                arrhenius_low = [pre_exponential_factor,
-                                 temperature_exponent,
-                                 activation_energy]
-                return arrhenius_low
-
-        def build_nasa(nasa_coeffs, row):
-            """
-            Creates string of nasa polynomial coefficients
-
-            :param nasa_coeffs
-                cantera species thermo coefficients object
-            :param row
-                which row to write coefficients in
-            """
-            line_coeffs = ''
-            lines = [[1, 2, 3, 4, 5], [6, 7, 8, 9, 10], [11, 12, 13, 14]]
-            line_index = lines[row - 2]
-            for ix, c in enumerate(nasa_coeffs):
-                if ix in line_index:
-                    if c >= 0:
-                        line_coeffs += ' '
-                    line_coeffs += str('{:.8e}'.format(c))
-            return line_coeffs
-
-        def build_species_string():
-            """
-            formats species string for writing
-            """
-            species_list_string = ''
-            line = 1
-            for sp_index, sp_string in enumerate(trimmed_solution.species_names):
-                sp = ' '
-                # get length of string next species is added
-                length_new = len(sp_string)
-                length_string = len(species_list_string)
-                total = length_new + length_string + 3
-                # if string will go over width, wrap to new line
-                if total >= 70 * line:
-                    species_list_string += '\n'
-                    line += 1
-                species_list_string += sp_string + ((16 - len(sp_string)) * sp)
-            return species_list_string
-
-        title = ''
-        section_break = ('!' + "-" * 75 + '\n'
-                                          '!  ' + title + '\n'
-                                                          '!' + "-" * 75 + '\n')
-
-        # Write title block to file
-        title = 'Chemkin File converted from Solution Object by pyMARS'
-        f.write(section_break)
-
-        # Write phase definition to file
-        element_names = eliminate(str(trimmed_solution.element_names),
-                                  ['[', ']', '\'', ','])
-        element_string = Template(
-            'ELEMENTS\n' +
-            '$element_names\n' +
-            'END\n')
-        f.write(element_string.substitute(element_names=element_names))
-        species_names = build_species_string()
-        species_string = Template(
-            'SPECIES\n' +
-            '$species_names\n' +
-            'END\n')
-        f.write(species_string.substitute(species_names=species_names))
-
-        # Write species to file
-        title = 'Species data'
-        f.write(section_break)
-
-        # Write reactions to file
-        title = 'Reaction Data'
-        f.write(section_break)
-        f.write('REACTIONS\n')
-        # write data for each reaction in the Solution Object
-        for reac_index, equation_string in enumerate(trimmed_solution.reaction_equations()):
-            # factor for the perturbation
-            uf = factor[reac_index]
-            # print(str(reac_index + 1) + ' ' + equation_string + ' ' + str(uf))
-            equation_string = eliminate(equation_string, ' ', 'single')
-            equation_object = trimmed_solution.reaction(reac_index)
-            equation_type = type(equation_object).__name__
-
-            if equation_type == 'ThreeBodyReaction':
-                arrhenius = build_arrhenius(equation_object, equation_type, uf)
-                main_line = (
-                        '{:<51}'.format(equation_string) +
-                        '{:>9}'.format(arrhenius[0]) +
-                        '{:>9}'.format(arrhenius[1]) +
-                        '{:>11}'.format(arrhenius[2]) +
-                        '\n')
-                f.write(main_line)
-                # trimms efficiencies list
-                efficiencies = equation_object.efficiencies
-                trimmed_efficiencies = equation_object.efficiencies
-                for s in efficiencies:
-                    if s not in trimmed_solution.species_names:
-                        del trimmed_efficiencies[s]
-                replace_list_2 = {
-                    '{': '',
-                    '}': '/',
-                    '\'': '',
-                    ':': '/',
-                    ',': '/'}
-                efficiencies_string = replace_multiple(
-                    str(trimmed_efficiencies),
-                    replace_list_2)
-                secondary_line = str(efficiencies_string) + '\n'
-                if bool(efficiencies) is True:
-                    f.write(secondary_line)
-            if equation_type == 'ElementaryReaction':
-                arrhenius = build_arrhenius(equation_object, equation_type, uf)
-                main_line = (
-                        '{:<51}'.format(equation_string) +
-                        '{:>9}'.format(arrhenius[0]) +
-                        '{:>9}'.format(arrhenius[1]) +
-                        '{:>11}'.format(arrhenius[2]) +
-                        '\n')
-                f.write(main_line)
-            if equation_type == 'FalloffReaction':
-                arr_high = build_modified_arrhenius(equation_object, 'high', uf)
-                main_line = (
-                        '{:<51}'.format(equation_string) +
-                        '{:>9}'.format(arr_high[0]) +
-                        '{:>9}'.format(arr_high[1]) +
-                        '{:>11}'.format(arr_high[2]) +
-                        '\n')
-                f.write(main_line)
-                arr_low = build_modified_arrhenius(equation_object, 'low', uf)
-                second_line = (
-                        '     LOW  /' +
-                        '  ' + arr_low[0] +
-                        '  ' + arr_low[1] +
-                        '  ' + arr_low[2] + '/\n')
-                f.write(second_line)
-                j = equation_object.falloff.parameters
-                # If optional Arrhenius data included:
-                try:
-                    third_line = (
-                            '     TROE/' +
-                            '   ' + str(j[0]) +
-                            '  ' + str(j[1]) +
-                            '  ' + str(j[2]) + ' /\n')
-                    f.write(third_line)
-                except IndexError:
-                    pass
-                # trimms efficiencies list
-                efficiencies = equation_object.efficiencies
-                trimmed_efficiencies = equation_object.efficiencies
-                for s in efficiencies:
-                    if s not in trimmed_solution.species_names:
-                        del trimmed_efficiencies[s]
-                replace_list_2 = {
-                    '{': '',
-                    '}': '/',
-                    '\'': '',
-                    ':': '/',
-                    ',': '/'}
-                efficiencies_string = replace_multiple(
-                    str(trimmed_efficiencies),
-                    replace_list_2)
-
-                fourth_line = str(efficiencies_string) + '\n'
-                if bool(efficiencies) is True:
-                    f.write(fourth_line)
-            # dupluicate option
-            if equation_object.duplicate is True:
-                duplicate_line = ' DUPLICATE' + '\n'
-                f.write(duplicate_line)
-        f.write('END')
-    return output_file_name
-
-
-if __name__ == '__main__':
-    gas = ct.Solution('gri30.cti')
-    factor = np.ones(gas.n_reactions)
-    fname = 'test/chem.inp'
-    output_file_name = write(gas, factor=None, fname=fname)
-
-    for i_reac, equation in enumerate(gas.reactions()):
-        factor = np.ones(gas.n_reactions)
-        factor[i_reac] = 10
-        fname = 'test/chem.inp_' + str(i_reac)
-        write(gas, factor, fname=fname)
+from __future__ import print_function
+from __future__ import division
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from string import Template
+import cantera as ct
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+calories_constant = 4184.0  # number of calories in 1000 Joules of energy
+
+
+def _scale_arrhenius(A, Ea, A_low, Ea_low, three_body, coeff_sum, factor):
+    """
+    Applies perturbation factor and unit conversions to the raw
+    Arrhenius arrays
+
+    Kept as a standalone kernel over plain float arrays so numba can
+    compile it when available; the numpy expressions are used as-is
+    otherwise.
+    """
+    # three-body (and falloff low-pressure) rates carry one extra
+    # concentration, hence one extra factor of 10**3
+    unit_mult = np.where(three_body,
+                         10.0 ** (3 * coeff_sum),
+                         10.0 ** (3 * (coeff_sum - 1)))
+    A = A * factor * unit_mult
+    Ea = Ea / calories_constant
+    A_low = A_low * factor * 10.0 ** (3 * coeff_sum)
+    Ea_low = Ea_low / calories_constant
+    return A, Ea, A_low, Ea_low
+
+
+if njit is not None:
+    _scale_arrhenius = njit(cache=True)(_scale_arrhenius)
+
+# build_header() output per Solution object, keyed by id(solution).  The
+# header does not depend on the perturbation factor, so it is computed
+# once even when write() is called once per reaction.
+_HEADER_CACHE = {}
+
+# build_reaction_chunks() output for the identity perturbation (factor
+# all ones), keyed by id(solution).  Every perturbed file shares this
+# baseline, so a sweep only re-renders the one perturbed reaction and
+# splices it into these chunks.
+_CHUNKS_CACHE = {}
+
+
+# translation tables for str.translate: strip characters in one pass at
+# C level instead of one str.replace call per character
+_LIST_REPR_STRIP = str.maketrans('', '', '[]\',')
+_SPACE_STRIP = str.maketrans('', '', ' ')
+
+# one template for the main reaction line, so each line costs a single
+# format call instead of four plus string concatenation
+_MAIN_LINE = '{:<51}{:>9}{:>9}{:>11}\n'
+
+# reaction types the writer knows how to emit; anything else (Plog,
+# Chebyshev, chemically activated, ...) is skipped, as it was before
+# the Arrhenius extraction was vectorized
+_SUPPORTED_TYPES = ('ElementaryReaction', 'ThreeBodyReaction',
+                    'FalloffReaction')
+
+
+def build_efficiencies_string(efficiencies, species_names_set):
+    """
+    Formats third-body efficiencies as Chemkin 'SPECIES/ value/' pairs
+
+    Emits the pairs directly instead of rewriting the dict repr with
+    str() and character replacements, skipping species that are not in
+    the solution.
+
+    :param efficiencies
+        dict of third-body efficiencies
+    :param species_names_set
+        set of species names kept in the solution
+    """
+    return '/ '.join('{}/ {}'.format(s, v)
+                     for s, v in efficiencies.items()
+                     if s in species_names_set) + '/'
+
+
+def build_arrhenius_arrays(reactions, factor):
+    """
+    Builds scaled Arrhenius parameter arrays for all reactions at once
+
+    Extracts the pre-exponential factor, temperature exponent and
+    activation energy of every reaction into numpy arrays, then applies
+    the perturbation factor, the cgs unit conversion (a power of 10
+    depending on reaction type and reactant order) and the cal/mol
+    conversion in vectorized operations instead of per reaction.  For
+    falloff reactions the main arrays hold the high-pressure limit and
+    the low arrays hold the low-pressure limit (zero elsewhere).
+
+    :param reactions:
+        list of cantera reaction objects
+    :param factor:
+        vector of size n_reactions
+
+    :return:
+        tuple of arrays (A, b, Ea, A_low, b_low, Ea_low), A already
+        scaled by factor and unit conversion, Ea in cal/mol
+    """
+    n = len(reactions)
+    falloff = np.fromiter(
+        (type(r).__name__ == 'FalloffReaction' for r in reactions), bool, n)
+    three_body = np.fromiter(
+        (type(r).__name__ == 'ThreeBodyReaction' for r in reactions), bool, n)
+    coeff_sum = np.fromiter(
+        (sum(r.reactants.values()) for r in reactions), float, n)
+    # rate objects only for the types the writer emits; unsupported
+    # types have no plain .rate attribute and zero-fill the arrays
+    rates = [r.high_rate if f
+             else r.rate if type(r).__name__ in _SUPPORTED_TYPES
+             else None
+             for r, f in zip(reactions, falloff)]
+    A = np.fromiter(
+        (rate.pre_exponential_factor if rate is not None else 0.0
+         for rate in rates), float, n)
+    b = np.fromiter(
+        (rate.temperature_exponent if rate is not None else 0.0
+         for rate in rates), float, n)
+    Ea = np.fromiter(
+        (rate.activation_energy if rate is not None else 0.0
+         for rate in rates), float, n)
+    A_low = np.fromiter(
+        (r.low_rate.pre_exponential_factor if f else 0.0
+         for r, f in zip(reactions, falloff)), float, n)
+    b_low = np.fromiter(
+        (r.low_rate.temperature_exponent if f else 0.0
+         for r, f in zip(reactions, falloff)), float, n)
+    Ea_low = np.fromiter(
+        (r.low_rate.activation_energy if f else 0.0
+         for r, f in zip(reactions, falloff)), float, n)
+    factor = np.asarray(factor, dtype=float)
+    A, Ea, A_low, Ea_low = _scale_arrhenius(A, Ea, A_low, Ea_low,
+                                            three_body, coeff_sum, factor)
+    return A, b, Ea, A_low, b_low, Ea_low
+
+
+def build_nasa(nasa_coeffs, row):
+    """
+    Creates string of nasa polynomial coefficients
+
+    :param nasa_coeffs
+        cantera species thermo coefficients object
+    :param row
+        which row to write coefficients in
+    """
+    line_coeffs = ''
+    lines = [[1, 2, 3, 4, 5], [6, 7, 8, 9, 10], [11, 12, 13, 14]]
+    # index the wanted coefficients directly instead of scanning the
+    # whole array with a membership test per entry
+    for ix in lines[row - 2]:
+        c = nasa_coeffs[ix]
+        if c >= 0:
+            line_coeffs += ' '
+        line_coeffs += str('{:.8e}'.format(c))
+    return line_coeffs
+
+
+def build_species_string(solution):
+    """
+    formats species string for writing
+    """
+    parts = []
+    # running length of the string built so far, so the growing string
+    # is never re-measured or copied
+    current_len = 0
+    line = 1
+    for sp_string in solution.species_names:
+        # if string will go over width, wrap to new line
+        if len(sp_string) + current_len + 3 >= 70 * line:
+            parts.append('\n')
+            line += 1
+            current_len += 1
+        chunk = sp_string + ((16 - len(sp_string)) * ' ')
+        parts.append(chunk)
+        current_len += len(chunk)
+    return ''.join(parts)
+
+
+def build_header(solution):
+    """Builds the factor-independent part of the mechanism file (title
+    block, ELEMENTS and SPECIES sections, up to and including the
+    REACTIONS keyword), cached per solution object.
+
+    :param solution:
+        Cantera solution object
+    """
+    cached = _HEADER_CACHE.get(id(solution))
+    if cached is not None:
+        return cached
+
+    out = []
+    title = ''
+    section_break = ('!' + "-" * 75 + '\n'
+                                      '!  ' + title + '\n'
+                                                      '!' + "-" * 75 + '\n')
+
+    # Write title block to file
+    title = 'Chemkin File converted from Solution Object by pyMARS'
+    out.append(section_break)
+
+    # Write phase definition to file
+    element_names = str(solution.element_names).translate(_LIST_REPR_STRIP)
+    element_string = Template(
+        'ELEMENTS\n' +
+        '$element_names\n' +
+        'END\n')
+    out.append(element_string.substitute(element_names=element_names))
+    species_names = build_species_string(solution)
+    species_string = Template(
+        'SPECIES\n' +
+        '$species_names\n' +
+        'END\n')
+    out.append(species_string.substitute(species_names=species_names))
+
+    # Write species to file
+    title = 'Species data'
+    out.append(section_break)
+
+    # Write reactions to file
+    title = 'Reaction Data'
+    out.append(section_break)
+    out.append('REACTIONS\n')
+
+    header = ''.join(out)
+    _HEADER_CACHE[id(solution)] = header
+    return header
+
+
+def _emit_main_line(parts, equation_string, fmt):
+    parts.append(_MAIN_LINE.format(equation_string, fmt[0], fmt[1], fmt[2]))
+
+
+def _emit_efficiencies(parts, equation_object, species_names_set):
+    # trimms efficiencies list
+    efficiencies = equation_object.efficiencies
+    if efficiencies:
+        parts.append(build_efficiencies_string(
+            efficiencies, species_names_set) + '\n')
+
+
+def _emit_elementary(parts, equation_string, fmt, equation_object,
+                     species_names_set):
+    _emit_main_line(parts, equation_string, fmt)
+
+
+def _emit_three_body(parts, equation_string, fmt, equation_object,
+                     species_names_set):
+    _emit_main_line(parts, equation_string, fmt)
+    _emit_efficiencies(parts, equation_object, species_names_set)
+
+
+def _emit_falloff(parts, equation_string, fmt, equation_object,
+                  species_names_set):
+    _emit_main_line(parts, equation_string, fmt)
+    second_line = (
+            '     LOW  /' +
+            '  ' + fmt[3] +
+            '  ' + fmt[4] +
+            '  ' + fmt[5] + '/\n')
+    parts.append(second_line)
+    j = equation_object.falloff.parameters
+    # If optional Arrhenius data included:
+    try:
+        third_line = (
+                '     TROE/' +
+                '   ' + str(j[0]) +
+                '  ' + str(j[1]) +
+                '  ' + str(j[2]) + ' /\n')
+        parts.append(third_line)
+    except IndexError:
+        pass
+    _emit_efficiencies(parts, equation_object, species_names_set)
+
+
+# dispatch on the reaction type name through one dict lookup per
+# reaction instead of a chain of string comparisons
+_HANDLERS = {
+    'ElementaryReaction': _emit_elementary,
+    'ThreeBodyReaction': _emit_three_body,
+    'FalloffReaction': _emit_falloff,
+}
+
+
+def render_reaction_chunk(equation_object, fmt, species_names_set):
+    """
+    Renders the output lines of a single reaction as one string
+
+    :param equation_object
+        cantera reaction object
+    :param fmt
+        tuple of formatted (A, b, Ea, A_low, b_low, Ea_low) strings for
+        this reaction
+    :param species_names_set
+        set of species names kept in the solution
+    """
+    parts = []
+    equation_string = equation_object.equation.translate(_SPACE_STRIP)
+    handler = _HANDLERS.get(type(equation_object).__name__)
+    if handler is not None:
+        handler(parts, equation_string, fmt, equation_object,
+                species_names_set)
+    # dupluicate option
+    if equation_object.duplicate is True:
+        parts.append(' DUPLICATE' + '\n')
+    return ''.join(parts)
+
+
+def build_reaction_chunks(solution, factor):
+    """Builds the REACTIONS section as a list with one string chunk per
+    reaction, so a perturbed file can splice in a single re-rendered
+    chunk.  The identity-factor (all ones) list is cached per solution;
+    callers must not mutate the returned list.
+
+    :param solution:
+        Cantera solution object
+    :param factor:
+        vector of size n_reactions
+    """
+    identity = bool(np.all(np.equal(factor, 1.0)))
+    if identity:
+        cached = _CHUNKS_CACHE.get(id(solution))
+        if cached is not None:
+            return cached
+
+    # O(1) membership tests when trimming third-body efficiencies
+    species_names_set = frozenset(solution.species_names)
+    # fetch the reaction objects once; solution.reaction(i) rebuilds a
+    # wrapper object on every call
+    reactions = solution.reactions()
+    # scale all Arrhenius parameters in one vectorized pass, then format
+    # whole arrays at once with numpy's printf-style formatter
+    A, b, Ea, A_low, b_low, Ea_low = build_arrhenius_arrays(reactions, factor)
+    A_str = np.char.mod('%.3E', A)
+    b_str = np.char.mod('%.3f', b)
+    Ea_str = np.char.mod('%.2f', Ea)
+    A_low_str = np.char.mod('%.3E', A_low)
+    b_low_str = np.char.mod('%.3f', b_low)
+    Ea_low_str = np.char.mod('%.2f', Ea_low)
+    chunks = [render_reaction_chunk(
+                  equation_object,
+                  (A_str[i], b_str[i], Ea_str[i],
+                   A_low_str[i], b_low_str[i], Ea_low_str[i]),
+                  species_names_set)
+              for i, equation_object in enumerate(reactions)]
+    if identity:
+        _CHUNKS_CACHE[id(solution)] = chunks
+    return chunks
+
+
+def build_reactions(solution, factor):
+    """Builds the REACTIONS section body, with each reaction rate
+    perturbed by the corresponding entry of factor.
+
+    :param solution:
+        Cantera solution object
+    :param factor:
+        vector of size n_reactions
+    """
+    return ''.join(build_reaction_chunks(solution, factor)) + 'END'
+
+
+def write(solution, factor=None, fname=None):
+    """Function to write cantera solution object to inp file.
+
+    :param solution:
+        solution: Cantera solution object,
+        factor: vector of size n_reactions,
+        fname: Name of converted chemkin mechanism file
+
+    :return:
+        Name of trimmed Mechanism file (.inp)
+
+    >>> soln2ck.write(gas, factor, fname)
+    """
+    if factor is None:
+        factor = np.ones(solution.n_reactions)
+
+    if fname is None:
+        raise Exception("fname is None")
+
+    output_file_name = os.path.join(fname)
+    _write_output(output_file_name,
+                  build_header(solution) + build_reactions(solution, factor))
+    return output_file_name
+
+
+def write_perturbed(solution, reaction_index, uf, fname):
+    """Writes a mechanism file with a single reaction's rate scaled by uf.
+
+    Reuses the cached baseline chunks and re-renders only the perturbed
+    reaction, so each file of a sensitivity sweep costs one reaction's
+    formatting plus the final write instead of rebuilding the whole
+    REACTIONS section.
+
+    :param solution:
+        Cantera solution object
+    :param reaction_index:
+        index of the reaction to perturb
+    :param uf:
+        perturbation factor for that reaction
+    :param fname:
+        Name of converted chemkin mechanism file
+
+    :return:
+        Name of trimmed Mechanism file (.inp)
+    """
+    baseline = build_reaction_chunks(solution, np.ones(solution.n_reactions))
+    equation_object = solution.reaction(reaction_index)
+    A, b, Ea, A_low, b_low, Ea_low = build_arrhenius_arrays(
+        [equation_object], np.array([uf], dtype=float))
+    fmt = ('%.3E' % A[0], '%.3f' % b[0], '%.2f' % Ea[0],
+           '%.3E' % A_low[0], '%.3f' % b_low[0], '%.2f' % Ea_low[0])
+    chunk = render_reaction_chunk(equation_object, fmt,
+                                  frozenset(solution.species_names))
+    chunks = list(baseline)
+    chunks[reaction_index] = chunk
+    output_file_name = os.path.join(fname)
+    _write_output(output_file_name,
+                  build_header(solution) + ''.join(chunks) + 'END')
+    return output_file_name
+
+
+def _write_output(output_file_name, output):
+    # the whole mechanism is already one string, so write it with a
+    # single raw syscall instead of going through the buffered text layer
+    fd = os.open(output_file_name, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+    try:
+        os.write(fd, output.encode('utf-8'))
+    finally:
+        os.close(fd)
+
+
+# worker-side solution for the __main__ sweep; the Solution object
+# cannot be pickled, so each worker process rebuilds it from the
+# mechanism path and fills its own header/chunk caches on first use
+_worker_gas = None
+
+
+def _init_worker(mech):
+    global _worker_gas
+    _worker_gas = ct.Solution(mech)
+
+
+def _perturb_task(i_reac):
+    return write_perturbed(_worker_gas, i_reac, 10.0,
+                           'test/chem.inp_' + str(i_reac))
+
+
+if __name__ == '__main__':
+    mech = 'gri30.cti'
+    gas = ct.Solution(mech)
+    factor = np.ones(gas.n_reactions)
+    fname = 'test/chem.inp'
+    output_file_name = write(gas, factor=None, fname=fname)
+
+    # one output file per reaction, fanned out in index chunks to worker
+    # processes so the formatting runs outside the parent's GIL; each
+    # worker splices into its own cached baseline
+    with ProcessPoolExecutor(initializer=_init_worker,
+                             initargs=(mech,)) as executor:
+        list(executor.map(_perturb_task, range(gas.n_reactions),
+                          chunksize=32))